@@ -0,0 +1,133 @@
+# navi/core/fact_index.py
+
+from __future__ import annotations
+import re
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+POSSESSIVE_RE = re.compile(r"['\u2019]s\b")
+APOSTROPHE_RE = re.compile(r"['\u2019]")
+
+# Words that carry no signal for "which fact is relevant to this command"
+STOPWORDS = frozenset("""
+a an and are as at be but by can could do does for from has have i im in is it
+its me my of on or please so that the their them they this to was what when
+where which who why will with would you your navi
+""".split())
+
+def _fold(tok: str) -> str:
+    """Light suffix fold so 'dogs'/'dog', 'stories'/'story' and 'glasses'/'glass' meet."""
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 4 and tok.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return tok[:-2]
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith(("ss", "us", "is")):
+        return tok[:-1]
+    return tok
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase, drop possessives/apostrophes ("dog's" -> "dog", "don't" -> "dont"),
+    remove stopwords and fold plurals. Facts and queries go through the same path.
+    """
+    text = APOSTROPHE_RE.sub("", POSSESSIVE_RE.sub("", (text or "").lower()))
+    return [_fold(t) for t in TOKEN_RE.findall(text) if t not in STOPWORDS and len(t) > 1]
+
+class FactIndex:
+    """
+    Incremental TF-IDF index over one person's facts.
+
+    Each fact is stored as a sparse, L2-normalized term-frequency vector laid
+    out flat in three parallel NumPy arrays (term id, fact row, weight). The
+    arrays grow geometrically, so add() is amortized O(terms in fact) and a
+    search() is one vectorized pass: mask postings hitting the query terms,
+    weight them by IDF and bincount into per-fact scores.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._vocab: dict[str, int] = {}
+        self._df = np.zeros(64, dtype=np.int32)
+        self._term = np.empty(capacity, dtype=np.int32)
+        self._row = np.empty(capacity, dtype=np.int32)
+        self._weight = np.empty(capacity, dtype=np.float32)
+        self._nnz = 0
+        self.texts: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def build(cls, texts) -> "FactIndex":
+        texts = list(texts)
+        idx = cls(capacity=max(256, 8 * len(texts)))
+        for t in texts:
+            idx.add(t)
+        return idx
+
+    def add(self, text: str) -> None:
+        row = len(self.texts)
+        self.texts.append(text)
+
+        counts: dict[int, int] = {}
+        for tok in tokenize(text):
+            tid = self._vocab.setdefault(tok, len(self._vocab))
+            counts[tid] = counts.get(tid, 0) + 1
+        if not counts:
+            return
+
+        n = len(counts)
+        self._reserve(self._nnz + n, len(self._vocab))
+        ids = np.fromiter(counts.keys(), dtype=np.int32, count=n)
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=n)
+        end = self._nnz + n
+        self._term[self._nnz:end] = ids
+        self._row[self._nnz:end] = row
+        self._weight[self._nnz:end] = tf / np.sqrt(np.dot(tf, tf))
+        self._nnz = end
+        self._df[ids] += 1
+
+    def search(self, query: str, k: int = 12) -> list[tuple[int, float]]:
+        """
+        Return up to k (fact_row, score) pairs, best first. Facts sharing no
+        terms with the query are never returned.
+        """
+        if not self.texts or k <= 0:
+            return []
+        qids = sorted({self._vocab[t] for t in tokenize(query) if t in self._vocab})
+        if not qids:
+            return []
+
+        n_docs = len(self.texts)
+        qids = np.asarray(qids, dtype=np.int32)
+        idf = np.zeros(len(self._vocab), dtype=np.float32)
+        idf[qids] = np.log((1.0 + n_docs) / (1.0 + self._df[qids])) + 1.0
+
+        terms = self._term[:self._nnz]
+        hits = np.isin(terms, qids, assume_unique=False)
+        scores = np.bincount(self._row[:self._nnz][hits],
+                             weights=self._weight[:self._nnz][hits] * idf[terms[hits]],
+                             minlength=n_docs)
+
+        # Newer facts win ties
+        scores += np.arange(n_docs) * (1e-6 / n_docs)
+        matched = np.count_nonzero(scores >= 1e-3)
+        k = min(k, matched)
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def _reserve(self, nnz: int, vocab: int) -> None:
+        if nnz > len(self._term):
+            cap = max(nnz, 2 * len(self._term))
+            for name in ("_term", "_row", "_weight"):
+                old = getattr(self, name)
+                new = np.empty(cap, dtype=old.dtype)
+                new[:self._nnz] = old[:self._nnz]
+                setattr(self, name, new)
+        if vocab > len(self._df):
+            df = np.zeros(max(vocab, 2 * len(self._df)), dtype=np.int32)
+            df[:len(self._df)] = self._df
+            self._df = df
@@ -1,9 +1,10 @@
 # navi/core/memory.py
 
 from __future__ import annotations
-import json, os, tempfile
+import json, os, tempfile, time
 from pathlib import Path
-from datetime import datetime
+
+from navi.core.fact_index import FactIndex
 
 # --- Paths (override if you want via env) ---
 # <project_root>/data/memory/navi_memory.json
@@ -56,44 +57,105 @@ def _atomic_save(obj: dict) -> None:
         except Exception:
             pass
 
+# --- Per-person records ---
+# {"people": {uid: {"name", "facts": [{"text","source","weight","t"}], "recent_summary", "meta", "updated_at"}},
+#  "interactions": [{"uid","user","navi","t"}]}
+def _person(data: dict, uid: str) -> dict:
+    p = data.setdefault("people", {}).setdefault(uid, {})
+    p.setdefault("facts", [])
+    p.setdefault("meta", {})
+    return p
+
+def _fact_texts(person: dict) -> list[str]:
+    return [f["text"] if isinstance(f, dict) else str(f) for f in person.get("facts", [])]
+
+# uid -> FactIndex, kept in step with the store by remember_fact()
+_INDEXES: dict[str, FactIndex] = {}
+
+def _fact_index(uid: str, texts: list[str]) -> FactIndex:
+    idx = _INDEXES.get(uid)
+    # Rebuild if the file was edited behind our back
+    if idx is None or idx.texts != texts:
+        idx = _INDEXES[uid] = FactIndex.build(texts)
+    return idx
+
 # --- Public helpers you already use elsewhere ---
-def get_person_context() -> str:
+# When nothing matches the command, still hint at what's been going on lately
+FALLBACK_RECENT_FACTS = 3
+
+def get_person_context(uid: str = "default_user", query: str | None = None, k: int = 12) -> str:
     """
-    Returns a short, rolling 'who/what matters' string Navi can use as context.
+    Returns a short 'who/what matters' string Navi can use as context.
+    With a query (the user's command), facts are ranked by relevance to it;
+    otherwise the most recent ones are used.
     """
     data = _safe_load()
-    facts = data.get("facts", [])
-    if not facts:
+    person = data.get("people", {}).get(uid)
+    if not person:
         return ""
-    # keep it compact; adjust to taste
-    return "; ".join(facts[-12:])
 
-def remember_fact(text: str) -> None:
+    parts = []
+    if person.get("name"):
+        parts.append(f"Name: {person['name']}")
+    if person.get("recent_summary"):
+        parts.append(f"Recently: {person['recent_summary']}")
+
+    facts = _fact_texts(person)
+    if facts:
+        if query:
+            hits = _fact_index(uid, facts).search(query, k)
+            picked = [facts[i] for i, _ in hits] or facts[-FALLBACK_RECENT_FACTS:]
+        else:
+            picked = facts[-k:]
+        parts.append("Facts: " + "; ".join(picked))
+    return "\n".join(parts)
+
+def remember_person(uid: str, name: str | None = None, **meta) -> None:
     """
-    Persist a concise fact (e.g., 'User likes peppermint tea')
+    Create/update a person record (e.g., remember_person("josh", name="Josh", room="office"))
     """
-    if not text or not text.strip():
+    data = _safe_load()
+    p = _person(data, uid)
+    if name:
+        p["name"] = name.strip()
+    p["meta"].update({k: v for k, v in meta.items() if v is not None})
+    p["updated_at"] = time.time()
+    _atomic_save(data)
+
+def remember_fact(uid: str, fact: str, source: str = "voice", weight: float = 1.0) -> None:
+    """
+    Persist a concise fact about a person (e.g., 'Likes peppermint tea')
+    """
+    if not fact or not fact.strip():
         return
+    fact = fact.strip()
+    data = _safe_load()
+    p = _person(data, uid)
+    texts = _fact_texts(p)
+    if fact in texts:
+        return
+    idx = _fact_index(uid, texts)
+    p["facts"].append({"text": fact, "source": source, "weight": weight, "t": time.time()})
+    p["updated_at"] = time.time()
+    _atomic_save(data)
+    idx.add(fact)
+
+def set_recent_summary(uid: str, summary: str) -> None:
     data = _safe_load()
-    data.setdefault("facts", [])
-    if text not in data["facts"]:
-        data["facts"].append(text.strip())
+    p = _person(data, uid)
+    p["recent_summary"] = (summary or "").strip()
+    p["updated_at"] = time.time()
     _atomic_save(data)
 
-def save_interaction(role: str, content: str) -> None:
+def save_interaction(uid: str, user: str, navi: str) -> None:
     """
     Append to an interactions log for later summarization/distillation.
-    role ? {'user','assistant','system'}
     """
-    if not content:
+    if not user and not navi:
         return
     data = _safe_load()
     data.setdefault("interactions", [])
-    data["interactions"].append({
-        "ts": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-        "role": role,
-        "content": content,
-    })
+    data["interactions"].append({"uid": uid, "user": user, "navi": navi, "t": time.time()})
     # Optional: cap size so file doesn't grow forever
     MAX_INTERACTIONS = 2000
     if len(data["interactions"]) > MAX_INTERACTIONS:
@@ -134,7 +134,7 @@ def ask_openai(prompt: str, uid: Optional[str] = "default_user") -> str:
 
     # Build system with memory context
     try:
-        memory_context = get_person_context(uid)
+        memory_context = get_person_context(uid, query=prompt)
     except Exception as e:
         _log_err("get_person_context failed", e)
         memory_context = ""
@@ -0,0 +1,118 @@
+# navi/modules/speech/audio_buffer.py
+
+from __future__ import annotations
+import threading
+from typing import Optional
+
+# Overflow policies
+DROP_OLDEST = "drop_oldest"   # overwrite stale audio; freshest speech always wins
+DROP_NEWEST = "drop_newest"   # backpressure: refuse new blocks until reader catches up
+POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity block ring for PortAudio callbacks.
+
+    Storage is one preallocated bytearray split into `capacity` slots of
+    `block_bytes` each, so memory stays flat no matter how long a stream is
+    left open. put() copies the callback buffer straight into a slot through
+    a memoryview (no per-block bytes() allocation); get() hands one block back
+    to the recognizer. When the ring is full the policy decides who loses:
+    DROP_OLDEST evicts the stalest block, DROP_NEWEST rejects the incoming one.
+    """
+
+    def __init__(self, capacity: int, block_bytes: int, policy: str = DROP_OLDEST):
+        if capacity < 1 or block_bytes < 1:
+            raise ValueError("capacity and block_bytes must be positive")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        self.capacity = capacity
+        self.block_bytes = block_bytes
+        self.policy = policy
+
+        self._buf = bytearray(capacity * block_bytes)
+        self._view = memoryview(self._buf)
+        self._lens = [0] * capacity
+        self._head = 0      # next slot to read
+        self._count = 0     # filled slots
+        self._cond = threading.Condition()
+
+        # Counters (never reset by clear(); see reset_stats())
+        self.overruns = 0   # put() calls that found the ring full
+        self.dropped = 0    # blocks lost to the overflow policy (one put() may drop several)
+        self.flushed = 0    # blocks discarded by clear()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # --- Producer side (audio callback thread) ---
+    def put(self, data) -> bool:
+        """
+        Copy one callback buffer into the ring. Oversized buffers are split
+        across consecutive slots. Returns False if any of it was dropped.
+        """
+        src = memoryview(data).cast("B")
+        ok = True
+        with self._cond:
+            for off in range(0, len(src), self.block_bytes):
+                chunk = src[off:off + self.block_bytes]
+                if self._count == self.capacity:
+                    self.dropped += 1
+                    ok = False
+                    if self.policy == DROP_NEWEST:
+                        continue
+                    self._head = (self._head + 1) % self.capacity
+                    self._count -= 1
+                slot = (self._head + self._count) % self.capacity
+                start = slot * self.block_bytes
+                self._view[start:start + len(chunk)] = chunk
+                self._lens[slot] = len(chunk)
+                self._count += 1
+            if not ok:
+                self.overruns += 1
+            self._cond.notify()
+        return ok
+
+    # --- Consumer side ---
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Pop the oldest block. Blocks until data arrives; returns None on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._count > 0, timeout):
+                return None
+            slot = self._head
+            start = slot * self.block_bytes
+            out = bytes(self._view[start:start + self._lens[slot]])
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            return out
+
+    def get_nowait(self) -> Optional[bytes]:
+        return self.get(timeout=0)
+
+    def clear(self) -> int:
+        """Discard everything buffered (e.g. on wake/command mode switch)."""
+        with self._cond:
+            n = self._count
+            self._head = 0
+            self._count = 0
+            self.flushed += n
+            return n
+
+    # --- Diagnostics ---
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "block_bytes": self.block_bytes,
+                "policy": self.policy,
+                "buffered": self._count,
+                "overruns": self.overruns,
+                "dropped": self.dropped,
+                "flushed": self.flushed,
+            }
+
+    def reset_stats(self) -> None:
+        with self._cond:
+            self.overruns = self.dropped = self.flushed = 0
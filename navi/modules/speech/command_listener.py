@@ -1,19 +1,30 @@
 # navi/modules/speech/command_listener.py
 
-import queue
+import os
+import time
 import sounddevice as sd
 import vosk
 import json
 from pathlib import Path
 from navi.core.paths import model_path
+from navi.modules.speech.audio_buffer import AudioRingBuffer, DROP_NEWEST
 
 MODEL_PATH = model_path("vosk-model-small-en-us-0.15")
-q = queue.Queue()
+
+BLOCK_FRAMES = 8000  # 0.5s @ 16kHz
+BLOCK_BYTES = BLOCK_FRAMES * 2  # int16 mono
+
+# Blocks are drained while the stream is open, so a few seconds of slack is
+# plenty. Command audio must stay contiguous, so when the reader falls behind
+# we apply backpressure (drop the newest block) rather than punch holes in
+# the middle of an utterance.
+BUFFER_BLOCKS = int(os.getenv("NAVI_COMMAND_BUFFER_BLOCKS", "16"))
+q = AudioRingBuffer(BUFFER_BLOCKS, BLOCK_BYTES, policy=DROP_NEWEST)
 
 def callback(indata, frames, time, status):
     if status:
         print("[!] Audio status:", status)
-    q.put(bytes(indata))
+    q.put(indata)
 
 def listen_for_command(duration=5):
     """
@@ -26,23 +37,39 @@ def listen_for_command(duration=5):
     model = vosk.Model(str(MODEL_PATH))
     recognizer = vosk.KaldiRecognizer(model, 16000)
 
-    with sd.RawInputStream(samplerate=16000, blocksize=8000, dtype='int16',
+    # Anything left over from a previous command is stale
+    q.clear()
+
+    full_result = ""
+
+    def _consume(data):
+        nonlocal full_result
+        if recognizer.AcceptWaveform(data):
+            result = json.loads(recognizer.Result())
+            text = result.get("text", "").strip()
+            full_result += f"{text} "
+
+    with sd.RawInputStream(samplerate=16000, blocksize=BLOCK_FRAMES, dtype='int16',
                            channels=1, callback=callback):
-        sd.sleep(duration * 1000)
+        # Recognize while we record instead of after, so the ring never fills up
+        deadline = time.monotonic() + duration
+        while (remaining := deadline - time.monotonic()) > 0:
+            data = q.get(timeout=remaining)
+            if data is not None:
+                _consume(data)
 
-        full_result = ""
-        while not q.empty():
-            data = q.get()
-            if recognizer.AcceptWaveform(data):
-                result = json.loads(recognizer.Result())
-                text = result.get("text", "").strip()
-                full_result += f"{text} "
+        while (data := q.get_nowait()) is not None:
+            _consume(data)
 
         # Final flush
         result = json.loads(recognizer.FinalResult())
         final_text = result.get("text", "").strip()
         full_result += f"{final_text}"
 
+    if q.overruns:
+        print(f"[Command Mode] Audio buffer overruns: {q.overruns}, dropped blocks: {q.dropped}")
+        q.reset_stats()
+
     cleaned = full_result.strip()
     print(f"[Command Mode] You said: \"{cleaned}\"")
     return cleaned
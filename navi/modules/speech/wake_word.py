@@ -2,7 +2,6 @@
 
 import os
 import time
-import queue
 import json
 import re
 
@@ -13,6 +12,7 @@ from fuzzywuzzy import fuzz
 from navi.modules.speech.tts import play_file, speak
 from navi.modules.speech.command_listener import listen_for_command
 from navi.modules.ai.ai_brain import ask_openai
+from navi.modules.speech.audio_buffer import AudioRingBuffer, DROP_OLDEST
 from navi.core.paths import model_path
 
 # -----------------------
@@ -38,12 +38,20 @@ SILENT_PROMPT_ON_EMPTY = os.getenv("NAVI_EMPTY_PROMPT", "I didn't catch that. Pl
 DEV_ENV = os.getenv("NAVI_MIC_DEVICE")
 DEVICE_INDEX = int(DEV_ENV) if DEV_ENV and DEV_ENV.isdigit() else None
 
-# Shared audio queue
-q = queue.Queue()
+BLOCK_FRAMES = 16000  # ~1s chunks help short phrases
+BLOCK_BYTES = BLOCK_FRAMES * 2  # int16 mono
+
+# Shared audio ring. Wake listening only cares about the last few seconds,
+# so when the recognizer falls behind the oldest audio is overwritten.
+BUFFER_BLOCKS = int(os.getenv("NAVI_WAKE_BUFFER_BLOCKS", "4"))
+q = AudioRingBuffer(BUFFER_BLOCKS, BLOCK_BYTES, policy=DROP_OLDEST)
 
 # Global mic mute flag so we don't re-transcribe Navi's own voice
 MIC_MUTED = False
 
+# Wake capture is paused while a session owns the mic (command mode)
+WAKE_PAUSED = False
+
 # Common "end session" phrases
 STOP_RE = re.compile(
     r"\b(stop|cancel|nevermind|that's all|thanks navi|thank you navi|goodbye)\b",
@@ -57,10 +65,10 @@ STOP_RE = re.compile(
 def _callback(indata, frames, time_info, status):
     if status:
         print("[!] Audio status:", status)
-    # Drop frames while we're speaking/playing audio
-    if MIC_MUTED:
+    # Drop frames while we're speaking/playing audio or in a session
+    if MIC_MUTED or WAKE_PAUSED:
         return
-    q.put(bytes(indata))
+    q.put(indata)
 
 # -----------------------
 # Wake logic helpers
@@ -120,6 +128,7 @@ def listen_for_wake_word():
     then returns to wake listening. Mic is muted during TTS so Navi
     doesn't hear herself.
     """
+    global WAKE_PAUSED
     if not MODEL_PATH.exists():
         raise FileNotFoundError(f"Vosk model not found at {MODEL_PATH}")
 
@@ -131,7 +140,7 @@ def listen_for_wake_word():
 
     with sd.RawInputStream(
         samplerate=16000,
-        blocksize=16000,   # ~1s chunks help short phrases
+        blocksize=BLOCK_FRAMES,
         dtype='int16',
         channels=1,
         callback=_callback,
@@ -158,6 +167,10 @@ def listen_for_wake_word():
             # ---- Wake detection ----
             if is_wake_word(text):
                 print("🔊 Wake word detected!")
+                # Hand the mic to command mode; nothing the wake stream hears
+                # during the session is worth recognizing afterwards.
+                WAKE_PAUSED = True
+                q.clear()
                 _safe_play_sir()
 
                 # --- Multi-turn session ---
@@ -184,5 +197,15 @@ def listen_for_wake_word():
 
                     turns += 1
 
+                # Drop any stale audio and partial hypothesis so wake
+                # listening resumes on fresh input.
+                q.clear()
+                recognizer.Reset()
+                WAKE_PAUSED = False
+                stats = q.stats()
+                if stats["overruns"]:
+                    print(f"[Audio] Wake buffer overruns: {stats['overruns']}, dropped blocks: {stats['dropped']}")
+                q.reset_stats()
+
                 print("[NÄVÎ] Session ended. Returning to wake listening…")
                 # do NOT return; stay in outer loop
@@ -0,0 +1,391 @@
+# tests/bench/fakes.py
+
+"""
+Local stand-ins for everything the wake/session loop talks to:
+a scripted microphone (sounddevice), a tag-reading recognizer (vosk),
+and latency-injecting OpenAI / Polly / mpg123 replacements.
+"""
+
+from __future__ import annotations
+import io
+import json
+import random
+import struct
+import threading
+import time
+import types
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+RATE = 16000
+SAMPLE_BYTES = 2  # int16 mono
+
+# The last block of every clip starts with (MAGIC, clip_id) so the fake
+# recognizer knows what was "said" without needing a real acoustic model.
+MAGIC = 0x4E56  # "NV"
+END_ID = -1
+
+class ScriptExhausted(Exception):
+    """
+    Raised through the fake recognizer on the END clip so the loop unwinds
+    cleanly. A real recognizer ignores END; FakeMic.finished is what ends a run.
+    """
+
+# -----------------------
+# Clips / script
+# -----------------------
+
+@dataclass
+class Clip:
+    text: str
+    pcm: bytes
+    kind: str = "command"  # "wake" | "command" | "stop"
+    id: int = 0
+
+@dataclass
+class Session:
+    wake: Clip
+    commands: list[Clip] = field(default_factory=list)
+
+def read_wav(path: str | Path) -> bytes:
+    with wave.open(str(path), "rb") as w:
+        if w.getframerate() != RATE or w.getnchannels() != 1 or w.getsampwidth() != SAMPLE_BYTES:
+            raise ValueError(f"{path}: expected 16kHz mono int16 WAV")
+        return w.readframes(w.getnframes())
+
+def write_wav(path: str | Path, pcm: bytes) -> Path:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(SAMPLE_BYTES)
+        w.setframerate(RATE)
+        w.writeframes(pcm)
+    return Path(path)
+
+def synth_pcm(text: str, rng: random.Random, words_per_sec: float = 2.5) -> bytes:
+    """Low-level noise roughly as long as it takes to say `text`."""
+    seconds = max(0.6, len(text.split()) / words_per_sec)
+    n = int(seconds * RATE)
+    return struct.pack(f"<{n}h", *(rng.randint(-600, 600) for _ in range(n)))
+
+# -----------------------
+# Fake microphone (sounddevice)
+# -----------------------
+
+class FakeMic:
+    """
+    Plays a list of Sessions into whichever RawInputStreams are open.
+
+    The first stream opened is the wake stream; streams opened while it is
+    live are command streams. The wake stream waits for the previous
+    session to go quiet, then plays the next wake clip, replaying it if no
+    command stream opens within `wake_timeout` seconds. Each command stream
+    gets the session's next command clip followed by silence. Once every
+    session has run, `finished` is set, one END clip is played and the mic
+    goes quiet. Blocks are paced at real time divided by `speed`. `busy` is an optional
+    probe for "Navi is still talking/in a session", so the next wake word
+    isn't spoken over her.
+    """
+
+    def __init__(self, sessions: list[Session], speed: float = 20.0, gap_blocks: int = 2,
+                 wake_timeout: float = 3.0, max_wake_retries: int = 2, busy=None):
+        self.sessions = sessions
+        self.busy = busy
+        self.speed = speed
+        self.gap_blocks = gap_blocks
+        self.wake_timeout = wake_timeout
+        self.max_wake_retries = max_wake_retries
+        self.clips = {c.id: c for s in sessions for c in [s.wake, *s.commands]}
+
+        self._lock = threading.Lock()
+        self._wake_open = False
+        self._cmd_open = False
+        self.player_busy = False
+
+        self._i = 0               # current session
+        self._cmd_i = 0           # next command clip within the session
+        self._state = "gap"       # gap -> wake -> await -> session -> gap ...
+        self._idle = 0
+        self._tries = 0
+        self._wake_sent_at = 0.0
+        self._wake_t = 0.0        # perf_counter of the latest wake delivery
+        self._end_sent = False
+        self.finished = threading.Event()
+
+        # Results
+        self.completed = 0
+        self.missed = 0
+        self.wake_retries = 0
+        self.events: list[tuple[str, float, Clip]] = []   # (kind, t, clip) for tagged blocks delivered
+        self.wake_hits: list[float] = []                  # delivery time of each wake the loop acted on
+        self.on_session_start = None                      # callback(session_index)
+
+    @property
+    def done(self) -> bool:
+        return self._i >= len(self.sessions)
+
+    # --- sounddevice surface ---
+    def module(self) -> types.ModuleType:
+        mod = types.ModuleType("sounddevice")
+        mod.RawInputStream = lambda **kw: _FakeStream(self, **kw)
+        mod.sleep = lambda ms: time.sleep(ms / 1000.0 / self.speed)
+        return mod
+
+    # --- stream bookkeeping ---
+    def _open(self, stream: "_FakeStream") -> str:
+        with self._lock:
+            if not self._wake_open:
+                self._wake_open = True
+                return "wake"
+            self._cmd_open = True
+            if self._state == "await":
+                self._state = "session"
+                self.completed += 1
+                self.wake_hits.append(self._wake_t)
+            return "command"
+
+    def _close(self, role: str) -> None:
+        with self._lock:
+            if role == "wake":
+                self._wake_open = False
+            else:
+                self._cmd_open = False
+
+    def _next_command(self) -> Optional[Clip]:
+        with self._lock:
+            if self._state != "session" or self.done:
+                return None
+            cmds = self.sessions[self._i].commands
+            if self._cmd_i >= len(cmds):
+                return None
+            clip = cmds[self._cmd_i]
+            self._cmd_i += 1
+            return clip
+
+    def _next_wake(self) -> Optional[Clip]:
+        """Called per wake block; returns a clip to start playing, END clip, or None (silence)."""
+        with self._lock:
+            busy = self._cmd_open or self.player_busy or bool(self.busy and self.busy())
+            if self._state == "await":
+                if time.monotonic() - self._wake_sent_at < self.wake_timeout:
+                    return None
+                # The loop never picked up the wake word (e.g. still muted); replay or give up
+                self._tries += 1
+                if self._tries > self.max_wake_retries:
+                    self.missed += 1
+                    self._advance()
+                else:
+                    self.wake_retries += 1
+                    self._state = "gap"
+                    self._idle = self.gap_blocks
+                return None
+            if self._state == "session":
+                cmds = self.sessions[self._i].commands
+                if not busy and self._cmd_i >= len(cmds):
+                    self._advance()
+                return None
+            # gap
+            if busy:
+                self._idle = 0
+                return None
+            self._idle += 1
+            if self._idle < self.gap_blocks:
+                return None
+            if self.done:
+                self.finished.set()
+                if self._end_sent:
+                    return None
+                self._end_sent = True
+                return Clip("", b"", kind="end", id=END_ID)
+            if self._tries == 0 and self.on_session_start:
+                self.on_session_start(self._i)
+            self._state = "wake"
+            return self.sessions[self._i].wake
+
+    def _wake_delivered(self, t: float) -> None:
+        with self._lock:
+            self._state = "await"
+            self._wake_sent_at = time.monotonic()
+            self._wake_t = t
+
+    def _advance(self) -> None:
+        self._i += 1
+        self._cmd_i = 0
+        self._tries = 0
+        self._idle = 0
+        self._state = "gap"
+
+class _FakeStream:
+    def __init__(self, mic: FakeMic, samplerate=RATE, blocksize=8000, dtype="int16",
+                 channels=1, callback=None, device=None, **_):
+        self.mic = mic
+        self.block_bytes = blocksize * SAMPLE_BYTES
+        self.period = blocksize / samplerate / mic.speed
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+        self.role = None
+
+    def __enter__(self):
+        self.role = self.mic._open(self)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.mic._close(self.role)
+        return False
+
+    def _blocks(self, clip: Clip):
+        pcm = clip.pcm
+        pad = (-len(pcm)) % self.block_bytes
+        pcm = pcm + b"\0" * pad if pcm else b"\0" * self.block_bytes
+        n = len(pcm) // self.block_bytes
+        for k in range(n):
+            block = bytearray(pcm[k * self.block_bytes:(k + 1) * self.block_bytes])
+            if k == n - 1:
+                struct.pack_into("<hh", block, 0, MAGIC, clip.id)
+            yield block, k == n - 1
+
+    def _run(self):
+        silence = bytes(self.block_bytes)
+        pending = iter(())
+        playing = None
+        if self.role == "command":
+            clip = self.mic._next_command()
+            if clip is not None:
+                pending, playing = self._blocks(clip), clip
+
+        next_t = time.monotonic()
+        while not self._stop.is_set():
+            next_t += self.period
+            delay = next_t - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+
+            item = next(pending, None)
+            if item is None and self.role == "wake":
+                clip = self.mic._next_wake()
+                if clip is not None:
+                    pending, playing = self._blocks(clip), clip
+                    item = next(pending, None)
+            if item is None:
+                if self.mic.finished.is_set():
+                    continue  # script is over; stop feeding the loop
+                self.callback(silence, self.block_bytes // SAMPLE_BYTES, None, None)
+                continue
+
+            block, last = item
+            t = time.perf_counter()
+            self.callback(block, len(block) // SAMPLE_BYTES, None, None)
+            if last:
+                self.mic.events.append((playing.kind, t, playing))
+                if self.role == "wake" and playing.kind == "wake":
+                    self.mic._wake_delivered(t)
+
+# -----------------------
+# Fake recognizer (vosk)
+# -----------------------
+
+def fake_vosk_module(mic: FakeMic) -> types.ModuleType:
+    class Model:
+        def __init__(self, path):
+            self.path = path
+
+    class KaldiRecognizer:
+        def __init__(self, model, rate):
+            self._text = ""
+
+        def AcceptWaveform(self, data) -> bool:
+            if len(data) < 4:
+                return False
+            magic, cid = struct.unpack_from("<hh", data, 0)
+            if magic != MAGIC:
+                return False
+            if cid == END_ID:
+                raise ScriptExhausted()
+            self._text = mic.clips[cid].text
+            return True
+
+        def Result(self) -> str:
+            text, self._text = self._text, ""
+            return json.dumps({"text": text})
+
+        def FinalResult(self) -> str:
+            return self.Result()
+
+        def Reset(self) -> None:
+            self._text = ""
+
+    mod = types.ModuleType("vosk")
+    mod.Model = Model
+    mod.KaldiRecognizer = KaldiRecognizer
+    return mod
+
+# -----------------------
+# OpenAI / Polly / player
+# -----------------------
+
+def _latency(rng: random.Random, base: float, jitter: float) -> float:
+    return max(0.0, base + rng.uniform(-jitter, jitter))
+
+class FakeOpenAI:
+    """Drop-in for openai.OpenAI(...).chat.completions.create()."""
+
+    STOCK = [
+        "Alright, done.",
+        "Got it, let's do that.",
+        "Hmm, I'm not sure, but we can find out.",
+        "Sure thing.",
+    ]
+
+    def __init__(self, rng: random.Random, latency: float, jitter: float = 0.0, repeat: float = 0.5):
+        self.rng, self.latency, self.jitter, self.repeat = rng, latency, jitter, repeat
+        self.calls = 0
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def __call__(self, **client_kwargs):
+        # ai_brain builds a new client per request
+        return self
+
+    def _create(self, messages, **_):
+        self.calls += 1
+        time.sleep(_latency(self.rng, self.latency, self.jitter))
+        if self.rng.random() < self.repeat:
+            text = self.rng.choice(self.STOCK)
+        else:
+            text = f"Here's answer number {self.calls} for you."
+        msg = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+class FakePolly:
+    """Drop-in for the boto3 Polly client used by tts._synthesize_to_mp3()."""
+
+    def __init__(self, rng: random.Random, latency: float, jitter: float = 0.0):
+        self.rng, self.latency, self.jitter = rng, latency, jitter
+        self.calls = 0
+
+    def synthesize_speech(self, Text, **_):
+        self.calls += 1
+        time.sleep(_latency(self.rng, self.latency, self.jitter))
+        # ~1KB per word of fake "mp3"; only its size matters to the cache
+        return {"AudioStream": io.BytesIO(b"ID3" + b"\0" * (1024 * max(1, len(Text.split()))))}
+
+class FakePlayer:
+    """Replaces tts._play_mp3; 'plays' for a duration scaled by mic speed."""
+
+    def __init__(self, mic: FakeMic, seconds: float = 1.0):
+        self.mic = mic
+        self.seconds = seconds
+        self.plays: list[tuple[float, Path]] = []
+
+    def __call__(self, path: Path):
+        self.plays.append((time.perf_counter(), Path(path)))
+        self.mic.player_busy = True
+        try:
+            time.sleep(self.seconds / self.mic.speed)
+        finally:
+            self.mic.player_busy = False
@@ -0,0 +1,365 @@
+# tests/bench/soak.py
+
+"""
+End-to-end soak / throughput benchmark for the wake -> session loop.
+
+Drives the real listen_for_wake_word() and listen_for_command() against a
+scripted microphone, with local OpenAI and Polly stand-ins, for hundreds of
+sessions back to back, then reports latency percentiles, CPU, RSS growth,
+memory-file growth and TTS cache behavior.
+
+    python -m tests.bench.soak --sessions 300 --speed 20 --seed 7 --json bench.json
+
+Runs are seeded (script, LLM replies, injected latency), so two runs with the
+same arguments exercise exactly the same path. Because the loop reads its
+config at import time, run one benchmark per process.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+
+from tests.bench.fakes import (
+    Clip, Session, FakeMic, FakeOpenAI, FakePolly, FakePlayer, ScriptExhausted,
+    fake_vosk_module, read_wav, synth_pcm, write_wav,
+)
+
+WAKE_PHRASES = ["hey navi", "okay navi", "hi navy", "hey naughty"]
+COMMANDS = [
+    "what's the weather like today",
+    "tell me a programming joke",
+    "set a timer for ten minutes",
+    "what's on my calendar",
+    "remind me to water the plants",
+    "how do i reverse a list in python",
+    "turn on the office lights",
+]
+STOPS = ["thanks navi", "that's all", "goodbye"]
+
+# -----------------------
+# Script
+# -----------------------
+
+def build_script(n: int, rng: random.Random, wav_dir: Path, stop_ratio: float = 0.7) -> list[Session]:
+    """
+    Seeded sessions: a wake phrase, 1-3 commands, and usually a stop phrase
+    (otherwise the session ends on an empty turn). Clips are written out as
+    16kHz WAVs and read back, same as user-supplied recordings.
+    """
+    cache: dict[str, Path] = {}
+    next_id = 0
+
+    def clip(text: str, kind: str) -> Clip:
+        nonlocal next_id
+        if text not in cache:
+            cache[text] = write_wav(wav_dir / f"{len(cache):03d}.wav", synth_pcm(text, rng))
+        next_id += 1
+        return Clip(text, read_wav(cache[text]), kind, next_id)
+
+    sessions = []
+    for _ in range(n):
+        s = Session(clip(rng.choice(WAKE_PHRASES), "wake"))
+        for _ in range(rng.randint(1, 3)):
+            s.commands.append(clip(rng.choice(COMMANDS), "command"))
+        if rng.random() < stop_ratio:
+            s.commands.append(clip(rng.choice(STOPS), "stop"))
+        sessions.append(s)
+    return sessions
+
+def load_script(path: Path) -> list[Session]:
+    """
+    JSON list of {"wake": {"text", "wav"}, "commands": [{"text", "wav", "kind"?}]}.
+    WAV paths are relative to the script file.
+    """
+    base = path.parent
+    next_id = 0
+
+    def clip(d: dict, kind: str) -> Clip:
+        nonlocal next_id
+        next_id += 1
+        return Clip(d["text"], read_wav(base / d["wav"]), d.get("kind", kind), next_id)
+
+    return [Session(clip(s["wake"], "wake"), [clip(c, "command") for c in s.get("commands", [])])
+            for s in json.loads(path.read_text(encoding="utf-8"))]
+
+# -----------------------
+# Metrics
+# -----------------------
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak, not current, but better than nothing off Linux (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentiles(xs: list[float]) -> dict:
+    if not xs:
+        return {}
+    xs = sorted(xs)
+
+    def pct(p):
+        return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))]
+
+    return {"n": len(xs), "p50": pct(50), "p90": pct(90), "p99": pct(99), "max": xs[-1]}
+
+def dir_size(path: Path) -> tuple[int, int]:
+    files = [p for p in path.iterdir() if p.is_file()] if path.exists() else []
+    return len(files), sum(p.stat().st_size for p in files)
+
+@dataclass
+class Sample:
+    session: int
+    wall: float
+    cpu: float
+    rss: int
+    memory_file: int
+
+@dataclass
+class Report:
+    sessions: int
+    completed: int
+    missed: int
+    wake_retries: int
+    wall_s: float
+    cpu_s: float
+    wake_to_audio_ms: dict
+    command_to_reply_ms: dict
+    rss_start: int
+    rss_end: int
+    rss_slope_per_100: float
+    memory_file_start: int
+    memory_file_end: int
+    tts_requests: int
+    tts_misses: int
+    tts_cache_files: int
+    tts_cache_bytes: int
+    llm_calls: int
+    samples: list = field(default_factory=list)
+
+def _slope(samples: list[Sample], warmup: float = 0.2) -> float:
+    """Least-squares RSS growth in bytes per 100 sessions, skipping warmup."""
+    pts = samples[int(len(samples) * warmup):]
+    if len(pts) < 2:
+        return 0.0
+    n = len(pts)
+    mx = sum(p.session for p in pts) / n
+    my = sum(p.rss for p in pts) / n
+    var = sum((p.session - mx) ** 2 for p in pts)
+    if not var:
+        return 0.0
+    return 100 * sum((p.session - mx) * (p.rss - my) for p in pts) / var
+
+def _first_play_after(ts: list[float], plays) -> list[float]:
+    """Milliseconds from each timestamp to the first playback at or after it."""
+    out, j = [], 0
+    for t in sorted(ts):
+        while j < len(plays) and plays[j][0] < t:
+            j += 1
+        if j == len(plays):
+            break
+        out.append((plays[j][0] - t) * 1000)
+    return out
+
+def _latencies(mic: FakeMic, plays) -> tuple[list[float], list[float]]:
+    """
+    Wake: only the delivery the loop actually acted on (ignored replays and
+    missed sessions are excluded). Reply: every command clip; stop phrases
+    are skipped since their ack never touches the LLM.
+    """
+    commands = [t for kind, t, _ in mic.events if kind == "command"]
+    return _first_play_after(mic.wake_hits, plays), _first_play_after(commands, plays)
+
+# -----------------------
+# Run
+# -----------------------
+
+@dataclass
+class Config:
+    sessions: int = 200
+    seed: int = 1
+    speed: float = 20.0            # mic/playback time compression
+    llm_latency: float = 0.35      # seconds, real time
+    llm_jitter: float = 0.1
+    llm_repeat: float = 0.5        # share of replies drawn from a small stock set (TTS cache hits)
+    polly_latency: float = 0.15
+    polly_jitter: float = 0.05
+    playback: float = 1.0          # seconds of "audio" per play, divided by speed
+    command_seconds: float = 5.0   # listen_for_command() window, divided by speed
+    script: str | None = None
+    real_vosk: bool = False
+    quiet: bool = True
+
+def _install_fakes(mic: FakeMic, real_vosk: bool) -> None:
+    # No PortAudio/mic needed; the fake mic stands in for sounddevice
+    try:
+        import sounddevice  # noqa: F401
+    except (ImportError, OSError):
+        sys.modules["sounddevice"] = mic.module()
+    if not real_vosk:
+        sys.modules["vosk"] = fake_vosk_module(mic)
+
+def run(cfg: Config, workdir: Path) -> Report:
+    rng = random.Random(cfg.seed)
+    wav_dir = workdir / "wav"
+    wav_dir.mkdir(parents=True, exist_ok=True)
+    sessions = load_script(Path(cfg.script)) if cfg.script else build_script(cfg.sessions, rng, wav_dir)
+
+    # Must be set before navi.core.memory is first imported
+    os.environ["NAVI_DATA_DIR"] = str(workdir / "memory")
+    os.environ["NAVI_MEMORY_FILE"] = str(workdir / "memory" / "navi_memory.json")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    mic = FakeMic(sessions, speed=cfg.speed)
+    _install_fakes(mic, cfg.real_vosk)
+
+    from navi.core import memory
+    from navi.modules.speech import tts, command_listener, wake_word
+    from navi.modules.ai import ai_brain
+
+    llm = FakeOpenAI(random.Random(cfg.seed + 1), cfg.llm_latency, cfg.llm_jitter, cfg.llm_repeat)
+    polly = FakePolly(random.Random(cfg.seed + 2), cfg.polly_latency, cfg.polly_jitter)
+    player = FakePlayer(mic, cfg.playback)
+
+    ai_brain.OpenAI, ai_brain.HAS_V1_CLIENT, ai_brain.OPENAI_API_KEY = llm, True, "bench"
+    tts._polly, tts._play_mp3 = polly, player
+    tts.CACHE_DIR = workdir / "tts_cache"
+    tts.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    wake_word.sd = command_listener.sd = mic.module()
+    wake_word.listen_for_command = functools.partial(
+        command_listener.listen_for_command, duration=cfg.command_seconds / cfg.speed)
+    mic.busy = lambda: wake_word.WAKE_PAUSED or wake_word.MIC_MUTED
+
+    samples: list[Sample] = []
+    t0, c0 = time.perf_counter(), time.process_time()
+
+    def sample(i: int):
+        size = memory.MEM_FILE.stat().st_size if memory.MEM_FILE.exists() else 0
+        samples.append(Sample(i, time.perf_counter() - t0, time.process_time() - c0, rss_bytes(), size))
+
+    mic.on_session_start = sample
+    sample(0)
+
+    # The loop never returns on its own, so it runs in a daemon thread and the
+    # mic decides when the script is over. With the fake recognizer the END
+    # clip also unwinds the loop; a real Vosk recognizer just sits idle.
+    errors: list[BaseException] = []
+
+    def loop():
+        try:
+            wake_word.listen_for_wake_word()
+        except ScriptExhausted:
+            pass
+        except BaseException as e:
+            errors.append(e)
+
+    out = io.StringIO() if cfg.quiet else sys.stdout
+    with contextlib.redirect_stdout(out):
+        worker = threading.Thread(target=loop, name="navi-bench-loop", daemon=True)
+        worker.start()
+        while not mic.finished.wait(0.1) and worker.is_alive():
+            pass
+        worker.join(timeout=2.0)
+    if errors:
+        raise errors[0]
+    if not mic.finished.is_set():
+        raise RuntimeError("wake loop exited before the script finished")
+    sample(len(sessions))
+
+    wake_ms, reply_ms = _latencies(mic, player.plays)
+    files, size = dir_size(tts.CACHE_DIR)
+    tts_requests = sum(1 for _, p in player.plays if p.parent == tts.CACHE_DIR)
+    return Report(
+        sessions=len(sessions),
+        completed=mic.completed,
+        missed=mic.missed,
+        wake_retries=mic.wake_retries,
+        wall_s=samples[-1].wall,
+        cpu_s=samples[-1].cpu,
+        wake_to_audio_ms=percentiles(wake_ms),
+        command_to_reply_ms=percentiles(reply_ms),
+        rss_start=samples[0].rss,
+        rss_end=samples[-1].rss,
+        rss_slope_per_100=_slope(samples),
+        memory_file_start=samples[0].memory_file,
+        memory_file_end=samples[-1].memory_file,
+        tts_requests=tts_requests,
+        tts_misses=polly.calls,
+        tts_cache_files=files,
+        tts_cache_bytes=size,
+        llm_calls=llm.calls,
+        samples=[asdict(s) for s in samples],
+    )
+
+# -----------------------
+# Report
+# -----------------------
+
+def _fmt_pct(d: dict) -> str:
+    if not d:
+        return "n/a"
+    return f"p50 {d['p50']:.0f}  p90 {d['p90']:.0f}  p99 {d['p99']:.0f}  max {d['max']:.0f} ms  (n={d['n']})"
+
+def format_report(r: Report) -> str:
+    mib = 1024 * 1024
+    hits = r.tts_requests - r.tts_misses
+    hit_rate = hits / r.tts_requests if r.tts_requests else 0.0
+    return "\n".join([
+        "[Bench] NÄVÎ soak results",
+        f"  sessions         {r.completed}/{r.sessions} completed, {r.missed} missed, {r.wake_retries} wake retries",
+        f"  wake → audio     {_fmt_pct(r.wake_to_audio_ms)}",
+        f"  command → reply  {_fmt_pct(r.command_to_reply_ms)}",
+        f"  CPU              {r.cpu_s:.1f}s over {r.wall_s:.1f}s wall ({100 * r.cpu_s / max(r.wall_s, 1e-9):.1f}%)",
+        f"  RSS              {r.rss_start / mib:.1f} → {r.rss_end / mib:.1f} MiB "
+        f"({r.rss_slope_per_100 / 1024:+.1f} KiB/100 sessions after warmup)",
+        f"  memory file      {r.memory_file_start / 1024:.1f} → {r.memory_file_end / 1024:.1f} KiB",
+        f"  TTS cache        {r.tts_requests} requests, {hits} hits, {r.tts_misses} misses "
+        f"({100 * hit_rate:.0f}% hit), {r.tts_cache_files} files / {r.tts_cache_bytes / 1024:.0f} KiB",
+        f"  LLM calls        {r.llm_calls}",
+    ])
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    d = Config()
+    p.add_argument("--sessions", type=int, default=d.sessions)
+    p.add_argument("--seed", type=int, default=d.seed)
+    p.add_argument("--speed", type=float, default=d.speed, help="time compression for mic audio and playback")
+    p.add_argument("--llm-latency", type=float, default=d.llm_latency)
+    p.add_argument("--llm-jitter", type=float, default=d.llm_jitter)
+    p.add_argument("--llm-repeat", type=float, default=d.llm_repeat)
+    p.add_argument("--polly-latency", type=float, default=d.polly_latency)
+    p.add_argument("--polly-jitter", type=float, default=d.polly_jitter)
+    p.add_argument("--playback", type=float, default=d.playback)
+    p.add_argument("--command-seconds", type=float, default=d.command_seconds)
+    p.add_argument("--script", help="JSON session script with recorded WAVs (default: synthesized)")
+    p.add_argument("--real-vosk", action="store_true", help="recognize with the real Vosk model (needs real recordings)")
+    p.add_argument("--verbose", action="store_true", help="show the loop's own output")
+    p.add_argument("--json", help="also write the full report (incl. per-session samples) here")
+    a = p.parse_args(argv)
+
+    cfg = Config(a.sessions, a.seed, a.speed, a.llm_latency, a.llm_jitter, a.llm_repeat,
+                 a.polly_latency, a.polly_jitter, a.playback, a.command_seconds,
+                 a.script, a.real_vosk, not a.verbose)
+    with tempfile.TemporaryDirectory(prefix="navi-bench-") as tmp:
+        report = run(cfg, Path(tmp))
+    print(format_report(report))
+    if a.json:
+        Path(a.json).write_text(json.dumps(asdict(report), indent=2), encoding="utf-8")
+    return 0 if report.missed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# tests/bench/test_soak.py
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# The loop itself still needs these; only mic, Vosk, OpenAI and Polly are faked
+for mod in ("fuzzywuzzy", "boto3", "numpy"):
+    pytest.importorskip(mod)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def test_soak_smoke(tmp_path):
+    # Own process: the benchmark swaps modules and the loop reads config at import
+    out = tmp_path / "bench.json"
+    proc = subprocess.run(
+        [sys.executable, "-m", "tests.bench.soak", "--sessions", "4", "--speed", "50",
+         "--llm-latency", "0.01", "--llm-jitter", "0", "--polly-latency", "0.01", "--polly-jitter", "0",
+         "--json", str(out)],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["completed"] == report["sessions"] == 4
+    assert report["missed"] == 0
+    assert report["wake_to_audio_ms"]["n"] == 4
+    assert report["llm_calls"] == report["command_to_reply_ms"]["n"]
+    assert report["tts_misses"] <= report["tts_requests"]
+    assert report["memory_file_end"] > report["memory_file_start"]
+
+def test_mic_finishes_without_recognizer_help():
+    from tests.bench.fakes import FakeMic, END_ID
+
+    mic = FakeMic([], gap_blocks=1)
+    end = mic._next_wake()
+    assert end.id == END_ID and mic.finished.is_set()
+    # END is sent once; a real recognizer ignores it and the mic just goes quiet
+    assert mic._next_wake() is None
+
+def test_latencies_only_sample_acted_on_wakes():
+    from types import SimpleNamespace
+    from tests.bench.soak import _latencies
+
+    plays = [(1.010, "sir"), (1.500, "reply"), (9.020, "sir")]
+    mic = SimpleNamespace(
+        # wake at 0.0 was ignored and replayed at 1.0; session at 5.0 was missed
+        events=[("wake", 0.0, None), ("wake", 1.0, None), ("command", 1.2, None),
+                ("stop", 1.6, None), ("wake", 5.0, None), ("wake", 9.0, None)],
+        wake_hits=[1.0, 9.0],
+    )
+    wake, reply = _latencies(mic, plays)
+    assert [round(ms) for ms in wake] == [10, 20]
+    assert [round(ms) for ms in reply] == [300]
@@ -0,0 +1,99 @@
+# tests/test_audio_buffer.py
+
+import threading
+
+import pytest
+
+from navi.modules.speech.audio_buffer import AudioRingBuffer, DROP_OLDEST, DROP_NEWEST
+
+def _block(i: int, n: int = 4) -> bytes:
+    return bytes([i]) * n
+
+def test_rejects_bad_config():
+    with pytest.raises(ValueError):
+        AudioRingBuffer(0, 4)
+    with pytest.raises(ValueError):
+        AudioRingBuffer(2, 4, policy="nope")
+
+def test_fifo_and_wrap_around():
+    r = AudioRingBuffer(3, 4)
+    for i in range(3):
+        r.put(_block(i))
+    assert r.get_nowait() == _block(0)
+    assert r.get_nowait() == _block(1)
+    # head is now at slot 2; these land in slots 0 and 1
+    r.put(_block(3))
+    r.put(_block(4))
+    assert len(r) == 3
+    assert [r.get_nowait() for _ in range(3)] == [_block(2), _block(3), _block(4)]
+    assert r.get_nowait() is None
+
+def test_drop_oldest_keeps_freshest():
+    r = AudioRingBuffer(3, 4, policy=DROP_OLDEST)
+    results = [r.put(_block(i)) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert [r.get_nowait() for _ in range(3)] == [_block(2), _block(3), _block(4)]
+    assert r.overruns == 2
+    assert r.dropped == 2
+
+def test_drop_newest_applies_backpressure():
+    r = AudioRingBuffer(2, 4, policy=DROP_NEWEST)
+    results = [r.put(_block(i)) for i in range(4)]
+    assert results == [True, True, False, False]
+    assert [r.get_nowait() for _ in range(2)] == [_block(0), _block(1)]
+    assert r.overruns == 2
+    assert r.dropped == 2
+
+def test_oversized_buffer_split_across_slots():
+    r = AudioRingBuffer(4, 4)
+    assert r.put(b"abcdefghij")
+    assert len(r) == 3
+    assert [r.get_nowait() for _ in range(3)] == [b"abcd", b"efgh", b"ij"]
+
+def test_oversized_put_counts_one_overrun_for_many_drops():
+    r = AudioRingBuffer(2, 4, policy=DROP_NEWEST)
+    assert not r.put(b"x" * 16)
+    assert r.overruns == 1
+    assert r.dropped == 2
+    assert [r.get_nowait() for _ in range(2)] == [b"xxxx", b"xxxx"]
+
+def test_accepts_any_buffer_protocol_object():
+    import array
+    r = AudioRingBuffer(2, 4)
+    r.put(array.array("h", [1, 2]))
+    assert r.get_nowait() == b"\x01\x00\x02\x00"
+
+def test_clear_counts_flushed_and_resets_position():
+    r = AudioRingBuffer(3, 4)
+    for i in range(3):
+        r.put(_block(i))
+    r.get_nowait()
+    assert r.clear() == 2
+    assert len(r) == 0
+    assert r.flushed == 2
+    assert r.get_nowait() is None
+    r.put(_block(9))
+    assert r.get_nowait() == _block(9)
+
+def test_stats_and_reset():
+    r = AudioRingBuffer(1, 4)
+    r.put(_block(0))
+    r.put(_block(1))
+    r.clear()
+    s = r.stats()
+    assert (s["overruns"], s["dropped"], s["flushed"], s["buffered"]) == (1, 1, 1, 0)
+    r.reset_stats()
+    assert (r.overruns, r.dropped, r.flushed) == (0, 0, 0)
+
+def test_get_timeout_returns_none():
+    r = AudioRingBuffer(2, 4)
+    assert r.get(timeout=0.01) is None
+
+def test_get_wakes_on_put_from_other_thread():
+    r = AudioRingBuffer(2, 4)
+    t = threading.Timer(0.02, r.put, args=(_block(7),))
+    t.start()
+    try:
+        assert r.get(timeout=2) == _block(7)
+    finally:
+        t.join()
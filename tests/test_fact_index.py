@@ -0,0 +1,69 @@
+# tests/test_fact_index.py
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from navi.core.fact_index import FactIndex, tokenize
+
+def test_tokenize_folds_possessives_apostrophes_and_plurals():
+    assert tokenize("What is my dog's name?") == ["dog", "name"]
+    assert tokenize("Has two dogs") == ["two", "dog"]
+    assert tokenize("I don't like stories") == ["dont", "like", "story"]
+    assert tokenize("Lost her glasses, not the glass") == ["lost", "her", "glass", "not", "glass"]
+    # Short words and -ss/-us endings are left alone
+    assert tokenize("bus status") == ["bus", "status"]
+
+def test_possessive_query_matches_fact():
+    idx = FactIndex.build(["Has a dog named Rex", "Likes peppermint tea"])
+    assert [i for i, _ in idx.search("what is my dog's name")] == [0]
+
+def test_ranking_order():
+    idx = FactIndex.build([
+        "Likes peppermint tea",
+        "Drinks green tea every evening with honey",
+        "Allergic to peanuts",
+        "Prefers peppermint tea over coffee",
+    ])
+    rows = [i for i, _ in idx.search("peppermint tea")]
+    # Both peppermint-tea facts outrank the plain tea fact; peanuts never shows
+    assert set(rows[:2]) == {0, 3}
+    assert rows[2] == 1
+    assert 2 not in rows
+
+def test_newest_wins_ties():
+    idx = FactIndex.build(["Likes jazz", "Likes jazz music", "Likes jazz"])
+    # memory.py dedupes texts, but equal scores must still come back newest-first
+    rows = [i for i, _ in idx.search("jazz")]
+    assert rows[0] == 2
+    assert rows.index(2) < rows.index(0)
+
+def test_k_limits():
+    idx = FactIndex.build([f"fact about topic {i}" for i in range(10)])
+    assert len(idx.search("topic", k=3)) == 3
+    assert len(idx.search("topic", k=50)) == 10
+    assert idx.search("topic", k=0) == []
+    assert FactIndex().search("topic") == []
+
+def test_no_overlap_returns_nothing():
+    idx = FactIndex.build(["Likes tea"])
+    assert idx.search("weather tomorrow") == []
+
+def test_stopword_only_fact_is_indexed_but_never_matches():
+    idx = FactIndex.build(["it is what it is", "Likes tea"])
+    assert len(idx) == 2
+    assert idx.search("what is it") == []
+    assert [i for i, _ in idx.search("tea")] == [1]
+
+def test_incremental_add_grows_past_initial_capacity():
+    idx = FactIndex(capacity=4)
+    start_df = len(idx._df)
+    for i in range(200):
+        idx.add(f"unique{i} shared token{i}")
+    assert len(idx) == 200
+    assert len(idx._term) >= idx._nnz == 600
+    assert len(idx._df) > start_df
+    # Earlier postings survived every reallocation
+    assert [i for i, _ in idx.search("unique3")] == [3]
+    assert [i for i, _ in idx.search("token199")] == [199]
+    assert len(idx.search("shared", k=500)) == 200
@@ -0,0 +1,77 @@
+# tests/test_memory.py
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from navi.core import memory
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, "MEM_DIR", tmp_path)
+    monkeypatch.setattr(memory, "MEM_FILE", tmp_path / "navi_memory.json")
+    monkeypatch.setattr(memory, "_INDEXES", {})
+    return tmp_path / "navi_memory.json"
+
+def _facts(store, uid="josh"):
+    return [f["text"] for f in json.loads(store.read_text())["people"][uid]["facts"]]
+
+def test_remember_fact_dedupes_and_strips(store):
+    memory.remember_fact("josh", "Likes tea")
+    memory.remember_fact("josh", "  Likes tea ")
+    memory.remember_fact("josh", "")
+    assert _facts(store) == ["Likes tea"]
+
+def test_facts_are_per_user(store):
+    memory.remember_fact("josh", "Likes tea")
+    memory.remember_fact("sam", "Likes coffee")
+    assert "tea" in memory.get_person_context("josh", query="tea")
+    assert memory.get_person_context("sam", query="tea").endswith("Likes coffee")
+    assert memory.get_person_context("nobody") == ""
+
+def test_context_ranks_by_query():
+    memory.remember_person("josh", name="Josh", room="office")
+    memory.set_recent_summary("josh", "Working on Navi")
+    for f in ["Has a dog named Rex", "Likes peppermint tea", "Plays guitar", "Works in Python"]:
+        memory.remember_fact("josh", f)
+    ctx = memory.get_person_context("josh", query="what is my dog's name")
+    assert ctx.splitlines() == ["Name: Josh", "Recently: Working on Navi", "Facts: Has a dog named Rex"]
+
+def test_context_falls_back_to_recent_facts():
+    for i in range(6):
+        memory.remember_fact("josh", f"fact number {i}")
+    ctx = memory.get_person_context("josh", query="weather tomorrow")
+    recent = [f"fact number {i}" for i in range(6 - memory.FALLBACK_RECENT_FACTS, 6)]
+    assert ctx == "Facts: " + "; ".join(recent)
+
+def test_context_without_query_uses_last_k():
+    for i in range(5):
+        memory.remember_fact("josh", f"fact number {i}")
+    assert memory.get_person_context("josh", k=2) == "Facts: fact number 3; fact number 4"
+
+def test_remember_fact_updates_index_incrementally():
+    memory.remember_fact("josh", "Likes tea")
+    idx = memory._INDEXES["josh"]
+    memory.remember_fact("josh", "Has a dog named Rex")
+    assert memory._INDEXES["josh"] is idx
+    assert idx.texts == ["Likes tea", "Has a dog named Rex"]
+
+def test_index_rebuilds_when_file_changes_on_disk(store):
+    memory.remember_fact("josh", "Likes tea")
+    stale = memory._INDEXES["josh"]
+
+    data = json.loads(store.read_text())
+    data["people"]["josh"]["facts"] = [{"text": "Has a dog named Rex"}]
+    store.write_text(json.dumps(data))
+
+    assert memory.get_person_context("josh", query="dog") == "Facts: Has a dog named Rex"
+    assert memory._INDEXES["josh"] is not stale
+    assert memory._INDEXES["josh"].texts == ["Has a dog named Rex"]
+
+def test_save_interaction_logs_uid_user_and_reply(store):
+    for i in range(3):
+        memory.save_interaction("josh", f"q{i}", f"a{i}")
+    log = json.loads(store.read_text())["interactions"]
+    assert [(e["uid"], e["user"], e["navi"]) for e in log] == [("josh", f"q{i}", f"a{i}") for i in range(3)]